@@ -1,10 +1,13 @@
 from __future__ import annotations
 
-import copy
 import http
 import json
 import pathlib
 import random
+import sys
+import types
+from collections.abc import Callable
+from unittest import mock
 
 import pytest
 import rich
@@ -12,18 +15,21 @@ import rich.prompt
 import rich.console
 import serial.tools.list_ports  # type: ignore[import-untyped]
 from pytest_golden.plugin import GoldenTestFixture  # type: ignore[import-untyped]
+from responses import RequestsMock
 
 from pishock.zap import httpapi, core, serialapi
 from pishock.zap.cli import cli
 
 from tests.conftest import (
+    CONFIG_JSON,
+    # for type hints
     FakeCredentials,
     PiShockPatcher,
     HTTPPatcher,
     SerialPatcher,
     Runner,
     ConfigDataType,
-)  # for type hints
+)
 
 
 pytestmark = pytest.mark.skipif(
@@ -31,12 +37,15 @@ pytestmark = pytest.mark.skipif(
 )
 
 
-@pytest.fixture(autouse=True)
-def patcher_cli_name(
-    http_patcher: HTTPPatcher, monkeypatch: pytest.MonkeyPatch
-) -> None:
-    """Set up the correct name sent to the API for CLI invocations."""
-    monkeypatch.setattr(http_patcher, "NAME", f"{httpapi.NAME} CLI")
+class CLIHTTPPatcher(HTTPPatcher):
+    """HTTPPatcher expecting the name sent to the API for CLI invocations."""
+
+    NAME = f"{httpapi.NAME} CLI"
+
+
+@pytest.fixture
+def http_patcher(responses: RequestsMock) -> HTTPPatcher:
+    return CLIHTTPPatcher(responses=responses)
 
 
 class TestInit:
@@ -47,6 +56,19 @@ class TestInit:
         monkeypatch.delenv(cli.API_KEY_ENV_VAR)
         return runner
 
+    @pytest.fixture
+    def prompt_answers(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> Callable[[list[str]], None]:
+        """Answer the CLI's text prompts with the given answers, in order."""
+
+        def install(answers: list[str]) -> None:
+            monkeypatch.setattr(
+                rich.prompt.Prompt, "ask", mock.Mock(side_effect=answers)
+            )
+
+        return install
+
     @pytest.mark.parametrize("valid", [True, False])
     def test_init(
         self,
@@ -54,12 +76,11 @@ class TestInit:
         config_data: ConfigDataType,
         runner_noenv: Runner,
         http_patcher: HTTPPatcher,
-        monkeypatch: pytest.MonkeyPatch,
+        prompt_answers: Callable[[list[str]], None],
         credentials: FakeCredentials,
         valid: bool,
     ) -> None:
-        answers = iter([credentials.USERNAME, credentials.API_KEY])
-        monkeypatch.setattr(rich.prompt.Prompt, "ask", lambda text: next(answers))
+        prompt_answers([credentials.USERNAME, credentials.API_KEY])
         http_patcher.verify_credentials(valid)
 
         result = runner_noenv.run("init")
@@ -67,8 +88,7 @@ class TestInit:
 
         if valid:
             assert result.output == "✅ Credentials saved.\n"
-            with config_path.open("r") as f:
-                data = json.load(f)
+            data = json.loads(config_path.read_bytes())
             assert data == config_data
         else:
             assert result.output == "❌ Credentials are invalid.\n"
@@ -86,8 +106,7 @@ class TestInit:
         assert result.exit_code == 0
         assert result.output == "✅ Credentials saved.\n"
 
-        with config_path.open("r") as f:
-            data = json.load(f)
+        data = json.loads(config_path.read_bytes())
         assert data == config_data
 
     @pytest.mark.parametrize("confirmed", [True, False, "--force"])
@@ -98,6 +117,7 @@ class TestInit:
         runner_noenv: Runner,
         http_patcher: HTTPPatcher,
         monkeypatch: pytest.MonkeyPatch,
+        prompt_answers: Callable[[list[str]], None],
         credentials: FakeCredentials,
         confirmed: bool | str,
     ) -> None:
@@ -107,24 +127,20 @@ class TestInit:
             monkeypatch.setattr(rich.prompt.Confirm, "ask", lambda text: confirmed)
 
         if confirmed:
-            answers = iter([new_username, credentials.API_KEY])
-            monkeypatch.setattr(rich.prompt.Prompt, "ask", lambda text: next(answers))
+            prompt_answers([new_username, credentials.API_KEY])
             http_patcher.verify_credentials(True, username=new_username)
 
-        with config_path.open("w") as f:
-            json.dump(config_data, f)
+        config_path.write_bytes(CONFIG_JSON)
 
         force_arg = ["--force"] if confirmed == "--force" else []
         result = runner_noenv.run("init", *force_arg)
         assert result.exit_code == (0 if confirmed else 1)
 
-        expected_data = copy.deepcopy(config_data)
         if confirmed:
-            expected_data["api"]["username"] = new_username
+            config_data["api"]["username"] = new_username
 
-        with config_path.open("r") as f:
-            data = json.load(f)
-        assert data == expected_data
+        data = json.loads(config_path.read_bytes())
+        assert data == config_data
 
     @pytest.mark.parametrize(
         "has_user, has_key, suffix",
@@ -149,6 +165,9 @@ class TestInit:
             monkeypatch.setenv(cli.API_KEY_ENV_VAR, credentials.API_KEY)
         if has_user:
             monkeypatch.setenv(cli.API_USER_ENV_VAR, credentials.USERNAME)
+        # The output includes the name we were invoked as, which differs
+        # depending on how pytest was started (e.g. pytest-xdist workers).
+        monkeypatch.setattr(sys, "argv", ["pishock", "verify"])
 
         result = runner_noenv.run("verify")
         assert result.output == golden.out[f"output_{suffix}"]
@@ -158,19 +177,31 @@ class TestInit:
         self,
         runner_noenv: Runner,
         config_path: pathlib.Path,
-        config_data: ConfigDataType,
         http_patcher: HTTPPatcher,
     ) -> None:
-        with config_path.open("w") as f:
-            json.dump(config_data, f)
+        config_path.write_bytes(CONFIG_JSON)
         http_patcher.verify_credentials(True)
 
         result = runner_noenv.run("verify")
         assert result.exit_code == 0
 
 
-@pytest.mark.parametrize("online", [True, False])
-@pytest.mark.parametrize("paused", [True, False])
+@pytest.mark.parametrize(
+    "shocker, online, paused, key",
+    [
+        (shocker, online, paused, key)
+        for online, paused, key in [
+            (True, True, "output_paused"),
+            (True, False, "output"),
+            (False, True, "output_offline_paused"),
+            (False, False, "output_offline"),
+        ]
+        for shocker in ["api_shocker", "serial_shocker"]
+        # Serial API does not support offline status
+        if online or shocker == "api_shocker"
+    ],
+    indirect=["shocker"],
+)
 @pytest.mark.golden_test("golden/info.yml")
 def test_info(
     runner: Runner,
@@ -179,25 +210,18 @@ def test_info(
     online: bool,
     credentials: FakeCredentials,
     paused: bool,
+    key: str,
 ) -> None:
     if isinstance(patcher, HTTPPatcher):
         patcher.info(online=online, paused=paused)
         shocker_arg = credentials.SHARECODE
         serial_flag = []
-    elif not online:
-        pytest.skip("Serial API does not support offline status")
-        assert False  # for mypy
     else:
         patcher.info(paused=paused)  # for initial get_shocker()
         patcher.info(paused=paused)
         shocker_arg = str(credentials.SHOCKER_ID)
         serial_flag = ["--serial"]
 
-    key = "output"
-    if not online:
-        key += "_offline"
-    if paused:
-        key += "_paused"
     if isinstance(patcher, SerialPatcher):
         key += "_serial"
 
@@ -231,11 +255,33 @@ class TestOperations:
         if isinstance(patcher, SerialPatcher):
             patcher.info()
 
+    @pytest.fixture
+    def keysmash(
+        self, request: pytest.FixtureRequest, monkeypatch: pytest.MonkeyPatch
+    ) -> bool:
+        """Make the CLI's shock messages deterministic, with or without keysmash."""
+        keysmash: bool = request.param
+        fake_random = types.SimpleNamespace(
+            random=lambda: 0.01 if keysmash else 0.2,
+            choices=lambda values, k: "asdfg",
+            randint=random.randint,
+        )
+        monkeypatch.setattr(cli, "random", fake_random)
+        return keysmash
+
     @pytest.mark.parametrize(
-        "duration, api_duration",
-        [(0.3, 300), (1, 1), (2, 2)],
+        "duration, api_duration, keysmash, key",
+        [
+            (duration, api_duration, keysmash, key + ("_keysmash" if keysmash else ""))
+            for duration, api_duration, key in [
+                (0.3, 300, "output"),
+                (1, 1, "output"),
+                (2, 2, "output_long"),
+            ]
+            for keysmash in [True, False]
+        ],
+        indirect=["keysmash"],
     )
-    @pytest.mark.parametrize("keysmash", [True, False])
     @pytest.mark.golden_test("golden/shock.yml")
     def test_shock(
         self,
@@ -244,24 +290,15 @@ class TestOperations:
         serial_flag: str,
         shocker_arg: str,
         golden: GoldenTestFixture,
-        monkeypatch: pytest.MonkeyPatch,
         duration: float,
         api_duration: int,
         keysmash: bool,
+        key: str,
     ) -> None:
-        key = "output"
-        if duration > 1:
-            key += "_long"
-        if keysmash:
-            key += "_keysmash"
-
         patcher.operate(
             duration=duration if serial_flag else api_duration,
             operation=httpapi.Operation.SHOCK,
         )
-        monkeypatch.setattr(random, "random", lambda: 0.01 if keysmash else 0.2)
-        monkeypatch.setattr(random, "choices", lambda values, k: "asdfg")
-
         result = runner.run(
             *serial_flag, "shock", shocker_arg, "-d", str(duration), "-i", "2"
         )
@@ -336,9 +373,9 @@ class TestOperations:
         assert result.exit_code == (0 if serial_flag else 1)
 
 
-@pytest.mark.parametrize(
-    "operation, duration, intensity",
-    [
+INVALID_INPUTS = [
+    (operation, duration, intensity, f"output_{operation}_{duration}_{intensity}")
+    for operation, duration, intensity in [
         # invalid durations
         ("vibrate", "-1", "2"),
         ("vibrate", "a", "2"),
@@ -364,91 +401,85 @@ class TestOperations:
         ("beep", "0.05", None),
         # invalid intensites
         ("beep", "1", "2"),
-    ],
-)
-@pytest.mark.golden_test("golden/invalid-inputs.yml")
-def test_invalid_inputs(
-    runner: Runner,
-    golden: GoldenTestFixture,
-    operation: str,
-    duration: str,
-    intensity: str | None,
-) -> None:
-    args = [operation, runner.sharecode, "-d", duration]
-    if intensity is not None:
-        args += ["-i", intensity]
-    result = runner.run(*args)
-    assert result.output == golden.out[f"output_{operation}_{duration}_{intensity}"]
-    assert result.exit_code in [1, 2]
+    ]
+]
 
 
-@pytest.mark.parametrize("op", list(httpapi.Operation))
-@pytest.mark.parametrize(
-    "name, text",
-    [
+@pytest.mark.golden_test("golden/invalid-inputs.yml")
+def test_invalid_inputs(runner: Runner, golden: GoldenTestFixture) -> None:
+    # Rejected before any API call happens, so the cases can share one test
+    # (and its fixture setup) rather than being parametrized.
+    for operation, duration, intensity, key in INVALID_INPUTS:
+        args = [operation, runner.sharecode, "-d", duration]
+        if intensity is not None:
+            args += ["-i", intensity]
+        result = runner.run(*args)
+        assert result.output == golden.out[key], args
+        assert result.exit_code in [1, 2], args
+
+
+ERRORS = [
+    (op, op.name.lower(), text, f"output_{name}")
+    for op in httpapi.Operation
+    for name, text in [
         ("not_authorized", httpapi.NotAuthorizedError.TEXT),
         ("unknown_error", "Frobnicating the zap failed"),
-    ],
-)
+    ]
+]
+
+
 @pytest.mark.golden_test("golden/errors.yml")
 def test_errors(
-    runner: Runner,
-    http_patcher: HTTPPatcher,
-    golden: GoldenTestFixture,
-    op: httpapi.Operation,
-    name: str,
-    text: str,
+    runner: Runner, http_patcher: HTTPPatcher, golden: GoldenTestFixture
 ) -> None:
-    cmd = op.name.lower()
+    # All cases can share one test: responses hands out matching registrations
+    # in order, so each invocation gets its own error response.
+    for op, cmd, text, key in ERRORS:
+        intensity = None if op == httpapi.Operation.BEEP else 2
+        http_patcher.operate(body=text, operation=op, intensity=intensity)
 
-    intensity = None if op == httpapi.Operation.BEEP else 2
-    http_patcher.operate(body=text, operation=op, intensity=intensity)
+        args = [cmd, runner.sharecode, "-d", "1"]
+        if op != httpapi.Operation.BEEP:
+            args += ["-i", "2"]
+        result = runner.run(*args)
 
-    args = [cmd, runner.sharecode, "-d", "1"]
-    if op != httpapi.Operation.BEEP:
-        args += ["-i", "2"]
-    result = runner.run(*args)
-
-    assert result.output == golden.out[f"output_{name}"]
-    assert result.exit_code == 1
-
-
-@pytest.mark.parametrize("cmd, paused", [("pause", True), ("unpause", False)])
-def test_pause_unpause(
-    cmd: str,
-    paused: bool,
-    runner: Runner,
-    http_patcher: HTTPPatcher,
-) -> None:
-    http_patcher.info()
-    http_patcher.pause(paused)
-    result = runner.run(cmd, runner.sharecode)
-    assert not result.output
+        assert result.output == golden.out[key], args
+        assert result.exit_code == 1, args
 
 
 @pytest.mark.parametrize("cmd, paused", [("pause", True), ("unpause", False)])
 @pytest.mark.parametrize(
-    "name, text",
+    "key, text",
     [
-        ("not_authorized", httpapi.NotAuthorizedError.TEXT),
-        ("unknown_error", "Frobnicating the zap failed"),
+        pytest.param(None, httpapi.HTTPShocker._SUCCESS_MESSAGE_PAUSE, id="ok"),
+        pytest.param(
+            "output_not_authorized",
+            httpapi.NotAuthorizedError.TEXT,
+            id="not_authorized",
+        ),
+        pytest.param(
+            "output_unknown_error", "Frobnicating the zap failed", id="unknown_error"
+        ),
     ],
 )
 @pytest.mark.golden_test("golden/errors.yml")
-def test_pause_error(
+def test_pause(
     cmd: str,
     paused: bool,
     runner: Runner,
     http_patcher: HTTPPatcher,
     golden: GoldenTestFixture,
-    name: str,
+    key: str | None,
     text: str,
 ) -> None:
-    http_patcher.info()
-    http_patcher.pause(paused, body=text)
+    http_patcher.info_and_pause(paused, body=text)
     result = runner.run(cmd, runner.sharecode)
-    assert result.output == golden.out[f"output_{name}"]
-    assert result.exit_code == 1
+    if key is None:
+        assert not result.output
+        assert result.exit_code == 0
+    else:
+        assert result.output == golden.out[key]
+        assert result.exit_code == 1
 
 
 @pytest.mark.golden_test("golden/shockers.yml")
@@ -475,25 +506,26 @@ def test_shockers(
 
 
 @pytest.mark.golden_test("golden/verify.yml")
-@pytest.mark.parametrize("outcome", ["ok", "not_authorized", "http_error"])
 def test_verify(
     runner: Runner,
     http_patcher: HTTPPatcher,
     golden: GoldenTestFixture,
-    outcome: str,
 ) -> None:
-    if outcome == "ok":
-        http_patcher.verify_credentials(True)
-    elif outcome == "not_authorized":
-        http_patcher.verify_credentials(False)
-    else:
-        http_patcher.verify_credentials_raw(
-            status=http.HTTPStatus.INTERNAL_SERVER_ERROR
-        )
+    # The API side is covered by test_zap.py, this only checks how the CLI
+    # reports the outcomes, so they can share one test.
+    for outcome in ["ok", "not_authorized", "http_error"]:
+        if outcome == "ok":
+            http_patcher.verify_credentials(True)
+        elif outcome == "not_authorized":
+            http_patcher.verify_credentials(False)
+        else:
+            http_patcher.verify_credentials_raw(
+                status=http.HTTPStatus.INTERNAL_SERVER_ERROR
+            )
 
-    result = runner.run("verify")
-    assert result.output == golden.out[f"output_{outcome}"]
-    assert result.exit_code == (0 if outcome == "ok" else 1)
+        result = runner.run("verify")
+        assert result.output == golden.out[f"output_{outcome}"], outcome
+        assert result.exit_code == (0 if outcome == "ok" else 1), outcome
 
 
 @pytest.mark.golden_test("golden/misc.yml")
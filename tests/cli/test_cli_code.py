@@ -1,42 +1,54 @@
 from __future__ import annotations
 
-import copy
 import json
 import http
 import pathlib
+from typing import Any
 
 import pytest
 import rich.console
 import rich.prompt
 from pytest_golden.plugin import GoldenTestFixture  # type: ignore[import-untyped]
 
-from tests.conftest import HTTPPatcher, Runner, ConfigDataType  # for type hints
+from tests.conftest import (
+    CONFIG_JSON,
+    # for type hints
+    HTTPPatcher,
+    Runner,
+)
 
 
 pytestmark = pytest.mark.skipif(
     rich.console.WINDOWS, reason="Output looks different on Windows"
 )
 
+# Prepopulated shockers, see init_config
+SHOCKERS = {
+    "test1": {"sharecode": "62142069AA1", "shocker_id": 1001},
+    # unsorted to test sorting too
+    "test3": {"sharecode": "62142069AA3", "shocker_id": 1003},
+    "test2": {"sharecode": "62142069AA2", "shocker_id": 1002},
+}
+# The config file written by init_config, serialized once
+CONFIG_JSON_WITH_SHOCKERS = json.dumps({
+    **json.loads(CONFIG_JSON),
+    "shockers": SHOCKERS,
+}).encode("utf-8")
+
+
+def saved_shockers(config_path: pathlib.Path) -> dict[str, Any]:
+    """Get the shockers saved in the config file."""
+    shockers: dict[str, Any] = json.loads(config_path.read_bytes())["shockers"]
+    return shockers
+
 
 @pytest.fixture(autouse=True)
-def init_config(
-    config_data: ConfigDataType,
-    config_path: pathlib.Path,
-    request: pytest.FixtureRequest,
-) -> None:
+def init_config(config_path: pathlib.Path, request: pytest.FixtureRequest) -> None:
     """Prepopulate the config with some share codes."""
-    data = copy.deepcopy(config_data)
-
-    if not request.node.get_closest_marker("empty_config"):
-        data["shockers"] = {
-            "test1": {"sharecode": "62142069AA1", "shocker_id": 1001},
-            # unsorted to test sorting too
-            "test3": {"sharecode": "62142069AA3", "shocker_id": 1003},
-            "test2": {"sharecode": "62142069AA2", "shocker_id": 1002},
-        }
-
-    with config_path.open("w") as f:
-        json.dump(data, f)
+    if request.node.get_closest_marker("empty_config"):
+        config_path.write_bytes(CONFIG_JSON)
+    else:
+        config_path.write_bytes(CONFIG_JSON_WITH_SHOCKERS)
 
 
 has_codes_parametrize = pytest.mark.parametrize(
@@ -138,20 +150,15 @@ def test_add(
     assert result.output == golden.out[f"output{suffix}"]
     assert result.exit_code == 0
 
-    with config_path.open("r") as f:
-        data = json.load(f)
+    shockers = saved_shockers(config_path)
 
     if has_codes:
-        assert data["shockers"] == {
-            "test1": {"sharecode": "62142069AA1", "shocker_id": 1001},
-            "test3": {"sharecode": "62142069AA3", "shocker_id": 1003},
-            "test2": {"sharecode": "62142069AA2", "shocker_id": 1002},
+        assert shockers == {
+            **SHOCKERS,
             "test4": {"sharecode": new_code, "shocker_id": 1004},
         }
     else:
-        assert data["shockers"] == {
-            "test4": {"sharecode": new_code, "shocker_id": 1004}
-        }
+        assert shockers == {"test4": {"sharecode": new_code, "shocker_id": 1004}}
 
 
 @pytest.mark.empty_config
@@ -166,9 +173,8 @@ def test_add_code_not_found(
     result = runner.run("code", "add", "test4", "62142069AA4")
     assert result.output == golden.out["output"]
     assert result.exit_code == 1
-    with config_path.open("r") as f:
-        data = json.load(f)
-    assert not data["shockers"]
+    shockers = saved_shockers(config_path)
+    assert not shockers
 
 
 @pytest.mark.parametrize("confirmed", [True, False, "--force"])
@@ -200,20 +206,14 @@ def test_add_overwrite(
     assert result.output == golden.out[f"output_overwrite_{suffix}"]
     assert result.exit_code == (0 if confirmed else 1)
 
-    with config_path.open("r") as f:
-        data = json.load(f)
+    shockers = saved_shockers(config_path)
     if confirmed:
-        assert data["shockers"] == {
+        assert shockers == {
+            **SHOCKERS,
             "test1": {"sharecode": new_code, "shocker_id": 1001},
-            "test3": {"sharecode": "62142069AA3", "shocker_id": 1003},
-            "test2": {"sharecode": "62142069AA2", "shocker_id": 1002},
         }
     else:
-        assert data["shockers"] == {
-            "test1": {"sharecode": "62142069AA1", "shocker_id": 1001},
-            "test3": {"sharecode": "62142069AA3", "shocker_id": 1003},
-            "test2": {"sharecode": "62142069AA2", "shocker_id": 1002},
-        }
+        assert shockers == SHOCKERS
 
 
 @pytest.mark.golden_test("golden/sharecodes/add.yml")
@@ -226,13 +226,8 @@ def test_add_invalid(
     assert result.output == golden.out["output_invalid"]
     assert result.exit_code == 1
 
-    with config_path.open("r") as f:
-        data = json.load(f)
-    assert data["shockers"] == {
-        "test1": {"sharecode": "62142069AA1", "shocker_id": 1001},
-        "test3": {"sharecode": "62142069AA3", "shocker_id": 1003},
-        "test2": {"sharecode": "62142069AA2", "shocker_id": 1002},
-    }
+    shockers = saved_shockers(config_path)
+    assert shockers == SHOCKERS
 
 
 @has_codes_parametrize
@@ -250,16 +245,15 @@ def test_del(
     assert result.output == golden.out[f"output{suffix}"]
     assert result.exit_code == 0 if has_codes else 1
 
-    with config_path.open("r") as f:
-        data = json.load(f)
+    shockers = saved_shockers(config_path)
 
     if has_codes:
-        assert data["shockers"] == {
-            "test3": {"sharecode": "62142069AA3", "shocker_id": 1003},
-            "test2": {"sharecode": "62142069AA2", "shocker_id": 1002},
+        assert shockers == {
+            "test3": SHOCKERS["test3"],
+            "test2": SHOCKERS["test2"],
         }
     else:
-        assert data["shockers"] == {}
+        assert shockers == {}
 
 
 @pytest.mark.parametrize(
@@ -294,23 +288,18 @@ def test_rename(
     assert result.output == golden.out[f"output_{suffix}"]
     assert result.exit_code == (0 if successful else 1)
 
-    with config_path.open("r") as f:
-        data = json.load(f)
+    shockers = saved_shockers(config_path)
 
     if successful and overwrite:
-        assert data["shockers"] == {
-            "test3": {"sharecode": "62142069AA1", "shocker_id": 1001},
-            "test2": {"sharecode": "62142069AA2", "shocker_id": 1002},
+        assert shockers == {
+            "test3": SHOCKERS["test1"],
+            "test2": SHOCKERS["test2"],
         }
     elif successful:
-        assert data["shockers"] == {
-            "test4": {"sharecode": "62142069AA1", "shocker_id": 1001},
-            "test3": {"sharecode": "62142069AA3", "shocker_id": 1003},
-            "test2": {"sharecode": "62142069AA2", "shocker_id": 1002},
+        assert shockers == {
+            "test4": SHOCKERS["test1"],
+            "test3": SHOCKERS["test3"],
+            "test2": SHOCKERS["test2"],
         }
     else:
-        assert data["shockers"] == {
-            "test1": {"sharecode": "62142069AA1", "shocker_id": 1001},
-            "test3": {"sharecode": "62142069AA3", "shocker_id": 1003},
-            "test2": {"sharecode": "62142069AA2", "shocker_id": 1002},
-        }
+        assert shockers == SHOCKERS
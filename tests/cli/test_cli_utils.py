@@ -10,8 +10,12 @@ import click.exceptions
 from pishock.zap.cli import cli_utils
 from pishock.zap import httpapi, serialapi
 
-# for type hints
-from tests.conftest import FakeCredentials, ConfigDataType
+from tests.conftest import (
+    CONFIG_JSON,
+    # for type hints
+    FakeCredentials,
+    ConfigDataType,
+)
 
 
 @pytest.fixture
@@ -37,11 +41,9 @@ class TestConfig:
         self,
         config: cli_utils.Config,
         config_path: pathlib.Path,
-        config_data: ConfigDataType,
         credentials: FakeCredentials,
     ) -> None:
-        with config_path.open("w") as f:
-            json.dump(config_data, f)
+        config_path.write_bytes(CONFIG_JSON)
 
         config.load()
         assert config.username == credentials.USERNAME
@@ -58,8 +60,7 @@ class TestConfig:
         config.api_key = credentials.API_KEY
         config.save()
 
-        with config_path.open("r") as f:
-            data = json.load(f)
+        data = json.loads(config_path.read_bytes())
         assert data == config_data
 
     def test_load_shockers(
@@ -73,8 +74,7 @@ class TestConfig:
             "sharecode": credentials.SHARECODE,
             "shocker_id": credentials.SHOCKER_ID,
         }
-        with config_path.open("w") as f:
-            json.dump(config_data, f)
+        config_path.write_bytes(json.dumps(config_data).encode("utf-8"))
 
         config.load()
         assert config.shockers == {
@@ -92,8 +92,7 @@ class TestConfig:
         credentials: FakeCredentials,
     ) -> None:
         config_data["sharecodes"] = {"test": credentials.SHARECODE}
-        with config_path.open("w") as f:
-            json.dump(config_data, f)
+        config_path.write_bytes(json.dumps(config_data).encode("utf-8"))
 
         config.load()
         assert config.shockers == {
@@ -110,8 +109,7 @@ class TestConfig:
         config_data: ConfigDataType,
     ) -> None:
         del config_data["shockers"]
-        with config_path.open("w") as f:
-            json.dump(config_data, f)
+        config_path.write_bytes(json.dumps(config_data).encode("utf-8"))
 
         config.load()
         assert config.shockers == {}
@@ -5,15 +5,16 @@ import io
 import json
 import re
 import pathlib
-from typing import Any, Callable, Iterator, Dict, cast
+from collections.abc import Mapping
+from typing import Any, Callable, ClassVar, Iterator, Dict, Final, cast
 
 import pytest
 import rich
 import serial  # type: ignore[import-untyped]
 import platformdirs
 import click.testing
-import typer.testing
-from responses import RequestsMock, matchers
+import typer.main
+from responses import RequestsMock, matchers, registries
 from typing_extensions import TypeAlias
 
 import pishock
@@ -24,31 +25,37 @@ _MatcherType: TypeAlias = Callable[..., Any]
 ConfigDataType: TypeAlias = Dict[str, Dict[str, Any]]
 
 
+@pytest.fixture(scope="session")
+def _config_file(tmp_path_factory: pytest.TempPathFactory) -> Iterator[pathlib.Path]:
+    """Point platformdirs to a temporary config directory once per session.
+
+    Creating a fresh tmp_path (and re-patching platformdirs) for every test is
+    comparatively expensive, while the config directory only ever holds a single
+    config.json which config_path cleans up after each test.
+    """
+    path = tmp_path_factory.mktemp("config")
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(
+            platformdirs,
+            "user_config_dir",
+            lambda appname, appauthor: path,
+        )
+        yield path / "config.json"
+
+
 @pytest.fixture(autouse=True)
-def config_path(
-    monkeypatch: pytest.MonkeyPatch,
-    tmp_path: pathlib.Path,
-) -> pathlib.Path:
-    monkeypatch.setattr(
-        platformdirs,
-        "user_config_dir",
-        lambda appname, appauthor: tmp_path,
-    )
-    return tmp_path / "config.json"
+def config_path(_config_file: pathlib.Path) -> Iterator[pathlib.Path]:
+    yield _config_file
+    _config_file.unlink(missing_ok=True)
 
 
 @pytest.fixture
-def config_data(credentials: FakeCredentials) -> ConfigDataType:
-    return {
-        "api": {
-            "username": credentials.USERNAME,
-            "key": credentials.API_KEY,
-        },
-        "shockers": {},
-    }
+def config_data() -> ConfigDataType:
+    data: ConfigDataType = json.loads(CONFIG_JSON)
+    return data
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def pishock_api(credentials: FakeCredentials) -> httpapi.PiShockAPI:
     return httpapi.PiShockAPI(
         username=credentials.USERNAME, api_key=credentials.API_KEY
@@ -66,47 +73,72 @@ def serial_api(
     return serialapi.SerialAPI(credentials.SERIAL_PORT)
 
 
+# CliRunner keeps no state between invocations, so one instance is enough.
+_CLI_RUNNER = click.testing.CliRunner()
+# typer.testing.CliRunner converts the Typer app into a click command on every
+# invocation, which takes longer than most CLI tests themselves. Do it once.
+_CLI_COMMAND = typer.main.get_command(cli.app)
+
+
 class Runner:
     def __init__(self, sharecode: str) -> None:
-        self._runner = typer.testing.CliRunner()
         self.sharecode = sharecode  # for ease of access
 
     def run(self, *args: str) -> click.testing.Result:
-        result = self._runner.invoke(cli.app, args, catch_exceptions=False)
-        print(result.output)
-        return result
+        return _CLI_RUNNER.invoke(_CLI_COMMAND, args, catch_exceptions=False)
+
+
+@pytest.fixture(scope="session")
+def _shared_runner() -> Runner:
+    """A Runner shared by all tests, as it holds no per-test state."""
+    return Runner(FakeCredentials.SHARECODE)
 
 
 @pytest.fixture
-def runner(monkeypatch: pytest.MonkeyPatch, credentials: FakeCredentials) -> Runner:
+def runner(
+    _shared_runner: Runner,
+    monkeypatch: pytest.MonkeyPatch,
+    credentials: FakeCredentials,
+) -> Runner:
     rich.reconfigure(width=80, force_terminal=False)
     # for future console instances
     monkeypatch.setenv("COLUMNS", "80")
     monkeypatch.setenv("TERM", "dumb")
     monkeypatch.setenv(cli.API_USER_ENV_VAR, credentials.USERNAME)
     monkeypatch.setenv(cli.API_KEY_ENV_VAR, credentials.API_KEY)
-    return Runner(credentials.SHARECODE)
+    return _shared_runner
 
 
 class FakeCredentials:
-    USERNAME = "PISHOCK-USERNAME"
-    API_KEY = "PISHOCK-APIKEY"
-    SHARECODE = "62169420AAA"
-    SERIAL_PORT = "/dev/ttyFAKE"
-    SHOCKER_ID = 1001
-    CLIENT_ID = 621
+    USERNAME: Final = "PISHOCK-USERNAME"
+    API_KEY: Final = "PISHOCK-APIKEY"
+    SHARECODE: Final = "62169420AAA"
+    SERIAL_PORT: Final = "/dev/ttyFAKE"
+    SHOCKER_ID: Final = 1001
+    CLIENT_ID: Final = 621
+
+
+# A minimal valid config file, serialized once for tests which only need to write
+# it. Use the config_data fixture to get a (mutable) dict instead.
+CONFIG_JSON = json.dumps({
+    "api": {
+        "username": FakeCredentials.USERNAME,
+        "key": FakeCredentials.API_KEY,
+    },
+    "shockers": {},
+}).encode("utf-8")
 
 
 class APIURLs:
-    BASE = "https://do.pishock.com/api"
-    OPERATE = f"{BASE}/apioperate"
-    PAUSE = f"{BASE}/PauseShocker"
-    SHOCKER_INFO = f"{BASE}/GetShockerInfo"
-    GET_SHOCKERS = f"{BASE}/GetShockers"
-    VERIFY_CREDENTIALS = f"{BASE}/VerifyApiCredentials"
+    BASE: Final = "https://do.pishock.com/api"
+    OPERATE: Final = f"{BASE}/apioperate"
+    PAUSE: Final = f"{BASE}/PauseShocker"
+    SHOCKER_INFO: Final = f"{BASE}/GetShockerInfo"
+    GET_SHOCKERS: Final = f"{BASE}/GetShockers"
+    VERIFY_CREDENTIALS: Final = f"{BASE}/VerifyApiCredentials"
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def credentials() -> FakeCredentials:
     return FakeCredentials()
 
@@ -152,6 +184,11 @@ class HTTPPatcher(PiShockPatcher):
         "Content-Type": "application/json",
     }
     NAME = httpapi.NAME
+    # Sent with every request
+    CREDENTIALS: ClassVar[Mapping[str, str]] = {
+        "Username": FakeCredentials.USERNAME,
+        "Apikey": FakeCredentials.API_KEY,
+    }
 
     def __init__(
         self,
@@ -159,20 +196,29 @@ class HTTPPatcher(PiShockPatcher):
         responses: RequestsMock,
     ) -> None:
         self.responses = responses
+        # The same for every request, so only build it once.
+        self.header_matcher = matchers.header_matcher(self.HEADERS)
 
     # ApiOperate
 
+    # operate_matchers() argument names -> JSON keys sent to the API
+    _OPERATE_KEYS: ClassVar[Mapping[str, str]] = {
+        "op": "Op",
+        "duration": "Duration",
+        "intensity": "Intensity",
+        "name": "Name",
+        "apikey": "Apikey",
+        "code": "Code",
+    }
+
     def operate_matchers(self, **kwargs: Any) -> list[_MatcherType]:
-        data = {
-            "Username": FakeCredentials.USERNAME,
-        }
+        data: dict[str, Any] = {**self.CREDENTIALS}
         for k, v in kwargs.items():
-            k = k.capitalize()
             if v is not None:
-                data[k] = v
+                data[self._OPERATE_KEYS[k]] = v
         return [
             matchers.json_params_matcher(data),
-            matchers.header_matcher(self.HEADERS),
+            self.header_matcher,
         ]
 
     def operate_raw(self, **kwargs: Any) -> None:
@@ -208,11 +254,10 @@ class HTTPPatcher(PiShockPatcher):
     ) -> list[_MatcherType]:
         return [
             matchers.json_params_matcher({
-                "Username": FakeCredentials.USERNAME,
-                "Apikey": FakeCredentials.API_KEY,
+                **self.CREDENTIALS,
                 "Code": sharecode,
             }),
-            matchers.header_matcher(self.HEADERS),
+            self.header_matcher,
         ]
 
     def info_raw(self, **kwargs: Any) -> None:
@@ -245,12 +290,11 @@ class HTTPPatcher(PiShockPatcher):
     def pause_matchers(self, pause: bool) -> list[_MatcherType]:
         return [
             matchers.json_params_matcher({
-                "Username": FakeCredentials.USERNAME,
-                "Apikey": FakeCredentials.API_KEY,
+                **self.CREDENTIALS,
                 "ShockerId": FakeCredentials.SHOCKER_ID,
                 "Pause": pause,
             }),
-            matchers.header_matcher(self.HEADERS),
+            self.header_matcher,
         ]
 
     def pause_raw(self, **kwargs: Any) -> None:
@@ -261,16 +305,22 @@ class HTTPPatcher(PiShockPatcher):
     ) -> None:
         self.pause_raw(body=body, match=self.pause_matchers(pause))
 
+    def info_and_pause(
+        self, pause: bool, body: str = httpapi.HTTPShocker._SUCCESS_MESSAGE_PAUSE
+    ) -> None:
+        """Patch a pause on a fresh shocker, which looks up its info first."""
+        self.info()
+        self.pause(pause, body=body)
+
     # GetShockers
 
     def get_shockers_matchers(self) -> list[_MatcherType]:
         return [
             matchers.json_params_matcher({
-                "Username": FakeCredentials.USERNAME,
-                "Apikey": FakeCredentials.API_KEY,
+                **self.CREDENTIALS,
                 "ClientId": 1000,
             }),
-            matchers.header_matcher(self.HEADERS),
+            self.header_matcher,
         ]
 
     def get_shockers_raw(self, **kwargs: Any) -> None:
@@ -304,10 +354,10 @@ class HTTPPatcher(PiShockPatcher):
     ) -> list[_MatcherType]:
         return [
             matchers.json_params_matcher({
+                **self.CREDENTIALS,
                 "Username": username,
-                "Apikey": FakeCredentials.API_KEY,
             }),
-            matchers.header_matcher(self.HEADERS),
+            self.header_matcher,
         ]
 
     def verify_credentials_raw(self, **kwargs: Any) -> None:
@@ -424,11 +474,28 @@ def fake_serial() -> FakeSerial:
     return FakeSerial()
 
 
+@pytest.fixture
+def responses() -> Iterator[RequestsMock]:
+    """Like the pytest-responses fixture, but matching in registration order.
+
+    Tests register responses in the order they expect them to be requested, so
+    there's no need to scan all of them for a match.
+    """
+    with RequestsMock(registry=registries.OrderedRegistry) as rsps:
+        yield rsps
+
+
 @pytest.fixture
 def http_patcher(responses: RequestsMock) -> HTTPPatcher:
     return HTTPPatcher(responses=responses)
 
 
+def pytest_collection_modifyitems(items: list[pytest.Item]) -> None:
+    for item in items:
+        if item.get_closest_marker("golden_test") is not None:
+            item.add_marker(pytest.mark.golden)
+
+
 @pytest.fixture
 def serial_patcher(
     serial_api: serialapi.SerialAPI, monkeypatch: pytest.MonkeyPatch
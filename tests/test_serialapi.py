@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import itertools
 import re
 from typing import Any
 
@@ -11,22 +12,36 @@ from serial.tools.list_ports_common import ListPortInfo  # type: ignore[import-u
 from tests.conftest import FakeSerial, FakeCredentials, SerialPatcher
 from pishock.zap import serialapi
 
+MULTIPLE_FOUND_RE = re.compile(
+    re.escape(
+        "Multiple (possibly) PiShocks found via port autodetection: "
+        "/dev/ttyUSBFAKE1, /dev/ttyUSBFAKE2."
+    )
+)
+NONE_FOUND_RE = re.compile(re.escape("No PiShock found via port autodetection."))
+INFO_TIMEOUT_RE = re.compile(
+    re.escape(
+        "No info received within timeout. "
+        "Make sure the given device is indeed a PiShock."
+    )
+)
+
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def fake_info_match_1() -> ListPortInfo:
     info = ListPortInfo("/dev/ttyUSBFAKE1")
     info.vid, info.pid = serialapi.USB_IDS[0]
     return info
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def fake_info_match_2() -> ListPortInfo:
     info = ListPortInfo("/dev/ttyUSBFAKE2")
     info.vid, info.pid = serialapi.USB_IDS[1]
     return info
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def fake_info_no_match() -> ListPortInfo:
     return ListPortInfo("/dev/ttyUSBFAKE3")
 
@@ -69,9 +84,7 @@ class TestAutodetectPort:
         )
         with pytest.raises(
             serialapi.SerialAutodetectError,
-            match=re.escape(
-                "Multiple (possibly) PiShocks found via port autodetection: /dev/ttyUSBFAKE1, /dev/ttyUSBFAKE2."
-            ),
+            match=MULTIPLE_FOUND_RE,
         ):
             serialapi._autodetect_port()
 
@@ -87,7 +100,7 @@ class TestAutodetectPort:
         )
         with pytest.raises(
             serialapi.SerialAutodetectError,
-            match=re.escape("No PiShock found via port autodetection."),
+            match=NONE_FOUND_RE,
         ):
             serialapi._autodetect_port()
 
@@ -103,22 +116,20 @@ def test_init_autodetect(
     assert api.dev is fake_serial
 
 
-@pytest.mark.parametrize(
-    "cmd, value, expected",
-    [
-        ("info", None, b'{"cmd": "info"}\n'),
-        (
-            "addnetwork",
-            {"ssid": "test", "password": "hunter2"},
-            b'{"cmd": "addnetwork", "value": {"ssid": "test", "password": "hunter2"}}\n',
-        ),
-        ("removenetwork", "test", b'{"cmd": "removenetwork", "value": "test"}\n'),
-    ],
-)
-def test_build_cmd(
-    serial_api: serialapi.SerialAPI, cmd: str, value: Any, expected: bytes
-) -> None:
-    assert serial_api._build_cmd(cmd, value) == expected
+BUILD_CMD_CASES: list[tuple[str, Any, bytes]] = [
+    ("info", None, b'{"cmd": "info"}\n'),
+    (
+        "addnetwork",
+        {"ssid": "test", "password": "hunter2"},
+        b'{"cmd": "addnetwork", "value": {"ssid": "test", "password": "hunter2"}}\n',
+    ),
+    ("removenetwork", "test", b'{"cmd": "removenetwork", "value": "test"}\n'),
+]
+
+
+def test_build_cmd(serial_api: serialapi.SerialAPI) -> None:
+    for cmd, value, expected in BUILD_CMD_CASES:
+        assert serial_api._build_cmd(cmd, value) == expected, cmd
 
 
 def test_send_cmd(serial_api: serialapi.SerialAPI, fake_serial: FakeSerial) -> None:
@@ -157,13 +168,7 @@ def test_wait_info_timeout(
     serial_api: serialapi.SerialAPI, fake_serial: FakeSerial
 ) -> None:
     fake_serial.next_read = [b"not terminalinfo", b"TERMINALINFO: {}"]
-    with pytest.raises(
-        TimeoutError,
-        match=re.escape(
-            "No info received within timeout. "
-            "Make sure the given device is indeed a PiShock."
-        ),
-    ):
+    with pytest.raises(TimeoutError, match=INFO_TIMEOUT_RE):
         serial_api.wait_info(timeout=1)
 
 
@@ -206,11 +211,10 @@ def test_restart(serial_api: serialapi.SerialAPI, fake_serial: FakeSerial) -> No
 
 def test_monitor(serial_api: serialapi.SerialAPI, fake_serial: FakeSerial) -> None:
     data = [b"Hello", b"World"]
-    fake_serial.next_read = data
-    gen = serial_api.monitor()
-    # raises due to us patching in a list instead of using an actual blocking device
-    with pytest.raises(IndexError, match="pop from empty list"):
-        assert list(gen) == data
+    fake_serial.next_read = list(data)
+    # monitor() never ends by itself (an empty read is just a timeout), so only
+    # take as many lines as we have
+    assert list(itertools.islice(serial_api.monitor(), len(data))) == data
 
 
 def test_shocker_end(
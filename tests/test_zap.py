@@ -1,6 +1,8 @@
 from __future__ import annotations
 
 import http
+import re
+from collections.abc import Callable
 
 import pytest
 
@@ -12,6 +14,9 @@ from tests.conftest import (
     HTTPPatcher,
 )  # for type hints
 
+DURATION_RE = re.compile("duration needs to be between")
+INTENSITY_RE = re.compile("intensity needs to be between 0 and 100")
+
 
 def test_api_repr(
     pishock_api: httpapi.PiShockAPI, credentials: FakeCredentials
@@ -49,15 +54,28 @@ def test_beep(shocker: core.Shocker, patcher: PiShockPatcher) -> None:
     shocker.beep(duration=1)
 
 
-@pytest.mark.parametrize("success_msg", httpapi.HTTPShocker._SUCCESS_MESSAGES)
 def test_alternative_success_messages(
-    api_shocker: httpapi.HTTPShocker, http_patcher: HTTPPatcher, success_msg: str
+    api_shocker: httpapi.HTTPShocker, http_patcher: HTTPPatcher
 ) -> None:
-    http_patcher.operate(
-        body=success_msg,
-        operation=httpapi.Operation.VIBRATE,
-    )
-    api_shocker.vibrate(duration=1, intensity=2)
+    operations: list[tuple[httpapi.Operation, int | None, Callable[[], None]]] = [
+        (
+            httpapi.Operation.VIBRATE,
+            2,
+            lambda: api_shocker.vibrate(duration=1, intensity=2),
+        ),
+        (
+            httpapi.Operation.SHOCK,
+            2,
+            lambda: api_shocker.shock(duration=1, intensity=2),
+        ),
+        (httpapi.Operation.BEEP, None, lambda: api_shocker.beep(duration=1)),
+    ]
+    for operation, intensity, call in operations:
+        for success_msg in httpapi.HTTPShocker._SUCCESS_MESSAGES:
+            http_patcher.operate(
+                body=success_msg, operation=operation, intensity=intensity
+            )
+            call()
 
 
 def test_log_name_override(
@@ -88,98 +106,96 @@ def test_shocker_str(
     assert str(shocker) == expected
 
 
-@pytest.mark.parametrize(
-    "duration, api_duration",
-    [
-        (0, 0),
-        (1, 1),
-        (15, 15),
-        # floats
-        (0.0, 0),
-        (1.0, 1),
-        (15.0, 15),
-        (0.1, 100),
-        (0.3, 300),
-        (1.1, 1100),
-        (1.15, 1150),  # rounded down by API
-        (1.51, 1510),  # rounded down by API
-    ],
-)
-def test_valid_durations(
-    shocker: core.Shocker, patcher: PiShockPatcher, duration: float, api_duration: int
-) -> None:
-    patcher.operate(
-        duration=duration if shocker.IS_SERIAL else api_duration,
-    )
-    shocker.vibrate(duration=duration, intensity=2)
-
-
-@pytest.mark.parametrize("duration", [-1, 16, -1.0, 16.0, 1.6])
-class TestInvalidDuration:
-    def test_vibrate(self, shocker: core.Shocker, duration: int) -> None:
-        if shocker.IS_SERIAL and duration > 0:
-            pytest.xfail("TODO: check if we have max duration via serial!")
-
-        with pytest.raises(ValueError, match="duration needs to be between"):
-            shocker.vibrate(duration=duration, intensity=2)
-
-    def test_shock(self, shocker: core.Shocker, duration: int) -> None:
-        if shocker.IS_SERIAL and duration > 0:
-            pytest.xfail("TODO: check if we have max duration via serial!")
+VALID_DURATIONS = [
+    (0, 0),
+    (1, 1),
+    (15, 15),
+    # floats
+    (0.0, 0),
+    (1.0, 1),
+    (15.0, 15),
+    (0.1, 100),
+    (0.3, 300),
+    (1.1, 1100),
+    (1.15, 1150),  # rounded down by API
+    (1.51, 1510),  # rounded down by API
+]
+
+
+def test_valid_durations(shocker: core.Shocker, patcher: PiShockPatcher) -> None:
+    for duration, api_duration in VALID_DURATIONS:
+        patcher.operate(
+            duration=duration if shocker.IS_SERIAL else api_duration,
+        )
+        shocker.vibrate(duration=duration, intensity=2)
 
-        with pytest.raises(ValueError, match="duration needs to be between"):
-            shocker.shock(duration=duration, intensity=2)
 
-    def test_beep(self, shocker: core.Shocker, duration: int) -> None:
-        if shocker.IS_SERIAL and duration > 0:
-            pytest.xfail("TODO: check if we have max duration via serial!")
+def _check_invalid_durations(shocker: core.Shocker, durations: list[float]) -> None:
+    # All of those are rejected before talking to the shocker, so checking them in
+    # a single test is enough.
+    operations: list[Callable[[float], None]] = [
+        lambda duration: shocker.vibrate(duration=duration, intensity=2),
+        lambda duration: shocker.shock(duration=duration, intensity=2),
+        lambda duration: shocker.beep(duration=duration),
+    ]
+    for duration in durations:
+        for operation in operations:
+            with pytest.raises(ValueError, match=DURATION_RE):
+                operation(duration)
 
-        with pytest.raises(ValueError, match="duration needs to be between"):
-            shocker.beep(duration=duration)
 
+def test_negative_durations(shocker: core.Shocker) -> None:
+    _check_invalid_durations(shocker, [-1, -1.0])
 
-@pytest.mark.parametrize("intensity", [-1, 101])
-class TestInvalidIntensity:
-    def test_vibrate(self, shocker: core.Shocker, intensity: int) -> None:
-        with pytest.raises(ValueError, match="intensity needs to be between 0 and 100"):
-            shocker.vibrate(duration=1, intensity=intensity)
 
-    def test_shock(self, shocker: core.Shocker, intensity: int) -> None:
-        with pytest.raises(ValueError, match="intensity needs to be between 0 and 100"):
-            shocker.shock(duration=1, intensity=intensity)
+def test_too_long_durations(shocker: core.Shocker) -> None:
+    if shocker.IS_SERIAL:
+        pytest.skip("TODO: check if we have max duration via serial!")
+    _check_invalid_durations(shocker, [16, 16.0, 1.6])
 
 
-class TestOperationsNotAllowed:
-    def test_vibrate(
-        self, api_shocker: httpapi.HTTPShocker, http_patcher: HTTPPatcher
-    ) -> None:
-        http_patcher.operate(
-            body=httpapi.VibrateNotAllowedError.TEXT,
-            operation=httpapi.Operation.VIBRATE,
-        )
-        with pytest.raises(httpapi.VibrateNotAllowedError):
-            api_shocker.vibrate(duration=1, intensity=2)
+def test_invalid_intensities(shocker: core.Shocker) -> None:
+    operations: list[Callable[[int], None]] = [
+        lambda intensity: shocker.vibrate(duration=1, intensity=intensity),
+        lambda intensity: shocker.shock(duration=1, intensity=intensity),
+    ]
+    for intensity in [-1, 101]:
+        for operation in operations:
+            with pytest.raises(ValueError, match=INTENSITY_RE):
+                operation(intensity)
 
-    def test_shock(
-        self, api_shocker: httpapi.HTTPShocker, http_patcher: HTTPPatcher
-    ) -> None:
-        http_patcher.operate(
-            body=httpapi.ShockNotAllowedError.TEXT,
-            operation=httpapi.Operation.SHOCK,
-        )
-        with pytest.raises(httpapi.ShockNotAllowedError):
-            api_shocker.shock(duration=1, intensity=2)
 
-    def test_beep(
-        self, api_shocker: httpapi.HTTPShocker, http_patcher: HTTPPatcher
-    ) -> None:
-        http_patcher.operate(
-            body=httpapi.BeepNotAllowedError.TEXT,
-            operation=httpapi.Operation.BEEP,
-            intensity=None,
-        )
-        with pytest.raises(httpapi.BeepNotAllowedError):
-            api_shocker.beep(duration=1)
+@pytest.mark.parametrize(
+    "operation, exception, kwargs",
+    [
+        (
+            httpapi.Operation.VIBRATE,
+            httpapi.VibrateNotAllowedError,
+            {"duration": 1, "intensity": 2},
+        ),
+        (
+            httpapi.Operation.SHOCK,
+            httpapi.ShockNotAllowedError,
+            {"duration": 1, "intensity": 2},
+        ),
+        (httpapi.Operation.BEEP, httpapi.BeepNotAllowedError, {"duration": 1}),
+    ],
+    ids=["vibrate", "shock", "beep"],
+)
+def test_operation_not_allowed(
+    api_shocker: httpapi.HTTPShocker,
+    http_patcher: HTTPPatcher,
+    operation: httpapi.Operation,
+    exception: type[httpapi.APIError],
+    kwargs: dict[str, int],
+) -> None:
+    http_patcher.operate(
+        body=exception.TEXT,
+        operation=operation,
+        intensity=kwargs.get("intensity"),
+    )
+    with pytest.raises(exception):
+        getattr(api_shocker, operation.name.lower())(**kwargs)
 
 
 def test_beep_no_intensity(shocker: core.Shocker) -> None:
@@ -195,66 +211,73 @@ def test_device_in_use(
         api_shocker.vibrate(duration=1, intensity=2)
 
 
-def test_unauthorized(http_patcher: HTTPPatcher, credentials: FakeCredentials) -> None:
-    http_patcher.operate(
-        body=httpapi.NotAuthorizedError.TEXT,
-        apikey="wrong",
-        code="wrong",
-    )
-    api = httpapi.PiShockAPI(username=credentials.USERNAME, api_key="wrong")
-    shocker = api.shocker(sharecode="wrong")
-    with pytest.raises(httpapi.NotAuthorizedError):
+@pytest.mark.parametrize(
+    "body, exception, overrides",
+    [
+        pytest.param(
+            httpapi.NotAuthorizedError.TEXT,
+            httpapi.NotAuthorizedError,
+            {"apikey": "wrong", "code": "wrong"},
+            id="not_authorized",
+        ),
+        pytest.param(
+            httpapi.ShareCodeNotFoundError.TEXT,
+            httpapi.ShareCodeNotFoundError,
+            {"code": "wrong"},
+            id="unknown_share_code",
+        ),
+        pytest.param(
+            "Failed to frobnicate the zap.",
+            httpapi.UnknownError,
+            {},
+            id="unknown_error",
+        ),
+    ],
+)
+def test_operate_error(
+    http_patcher: HTTPPatcher,
+    credentials: FakeCredentials,
+    body: str,
+    exception: type[Exception],
+    overrides: dict[str, str],
+) -> None:
+    apikey = overrides.get("apikey", credentials.API_KEY)
+    code = overrides.get("code", credentials.SHARECODE)
+    http_patcher.operate(body=body, apikey=apikey, code=code)
+    api = httpapi.PiShockAPI(username=credentials.USERNAME, api_key=apikey)
+    shocker = api.shocker(sharecode=code)
+    with pytest.raises(exception, match=re.escape(body)):
         shocker.vibrate(duration=1, intensity=2)
 
 
-def test_unknown_share_code(
-    pishock_api: httpapi.PiShockAPI, http_patcher: HTTPPatcher
-) -> None:
-    http_patcher.operate(
-        body=httpapi.ShareCodeNotFoundError.TEXT,
-        code="wrong",
-    )
-    shocker = pishock_api.shocker(sharecode="wrong")
-    with pytest.raises(httpapi.ShareCodeNotFoundError):
-        shocker.vibrate(duration=1, intensity=2)
+def test_pause(api_shocker: httpapi.HTTPShocker, http_patcher: HTTPPatcher) -> None:
+    http_patcher.info_and_pause(True)
+    http_patcher.pause(False)  # info is cached by the first call
+    api_shocker.pause(True)
+    api_shocker.pause(False)
 
 
-def test_unknown_error(
+@pytest.mark.parametrize(
+    "body, exception",
+    [
+        pytest.param(
+            httpapi.NotAuthorizedError.TEXT,
+            httpapi.NotAuthorizedError,
+            id="not_authorized",
+        ),
+        pytest.param(
+            "Shocker wanna go brrrrr.", httpapi.UnknownError, id="unknown_error"
+        ),
+    ],
+)
+def test_pause_error(
     api_shocker: httpapi.HTTPShocker,
-    pishock_api: httpapi.PiShockAPI,
     http_patcher: HTTPPatcher,
+    body: str,
+    exception: type[httpapi.APIError],
 ) -> None:
-    message = "Failed to frobnicate the zap."
-    http_patcher.operate(body=message)
-    with pytest.raises(httpapi.UnknownError, match=message):
-        api_shocker.vibrate(duration=1, intensity=2)
-
-
-@pytest.mark.parametrize("pause", [True, False])
-def test_pause(
-    api_shocker: httpapi.HTTPShocker, http_patcher: HTTPPatcher, pause: bool
-) -> None:
-    http_patcher.info()
-    http_patcher.pause(pause)
-    api_shocker.pause(pause)
-
-
-def test_pause_unauthorized(
-    api_shocker: httpapi.HTTPShocker, http_patcher: HTTPPatcher
-) -> None:
-    http_patcher.info()
-    http_patcher.pause(True, body=httpapi.NotAuthorizedError.TEXT)
-    with pytest.raises(httpapi.NotAuthorizedError):
-        api_shocker.pause(True)
-
-
-def test_pause_unknown_error(
-    api_shocker: httpapi.HTTPShocker, http_patcher: HTTPPatcher
-) -> None:
-    message = "Shocker wanna go brrrrr."
-    http_patcher.info()
-    http_patcher.pause(True, body=message)
-    with pytest.raises(httpapi.UnknownError, match=message):
+    http_patcher.info_and_pause(True, body=body)
+    with pytest.raises(exception, match=re.escape(body)):
         api_shocker.pause(True)
 
 
@@ -292,24 +315,18 @@ class TestInfo:
         with pytest.raises(httpapi.UnknownError, match=message):
             api_shocker.info()
 
-    @pytest.mark.parametrize(
-        "status, exception",
-        [
+    def test_http_errors(
+        self, api_shocker: httpapi.HTTPShocker, http_patcher: HTTPPatcher
+    ) -> None:
+        errors: list[tuple[http.HTTPStatus, type[httpapi.APIError]]] = [
             (http.HTTPStatus.NOT_FOUND, httpapi.ShareCodeNotFoundError),
             (http.HTTPStatus.FORBIDDEN, httpapi.NotAuthorizedError),
             (http.HTTPStatus.INTERNAL_SERVER_ERROR, httpapi.HTTPError),
-        ],
-    )
-    def test_http_errors(
-        self,
-        api_shocker: httpapi.HTTPShocker,
-        http_patcher: HTTPPatcher,
-        status: http.HTTPStatus,
-        exception: type[httpapi.APIError],
-    ) -> None:
-        http_patcher.info_raw(status=status)
-        with pytest.raises(exception):
-            api_shocker.info()
+        ]
+        for status, exception in errors:
+            http_patcher.info_raw(status=status)
+            with pytest.raises(exception):
+                api_shocker.info()
 
 
 class TestGetShockers:
@@ -343,23 +360,17 @@ class TestGetShockers:
         with pytest.raises(httpapi.UnknownError, match=message):
             pishock_api.get_shockers(client_id=1000)
 
-    @pytest.mark.parametrize(
-        "status, exception",
-        [
-            (http.HTTPStatus.FORBIDDEN, httpapi.NotAuthorizedError),
-            (http.HTTPStatus.INTERNAL_SERVER_ERROR, httpapi.HTTPError),
-        ],
-    )
     def test_http_errors(
-        self,
-        pishock_api: httpapi.PiShockAPI,
-        http_patcher: HTTPPatcher,
-        status: http.HTTPStatus,
-        exception: type[httpapi.APIError],
+        self, pishock_api: httpapi.PiShockAPI, http_patcher: HTTPPatcher
     ) -> None:
-        http_patcher.get_shockers_raw(status=status)
-        with pytest.raises(exception):
-            pishock_api.get_shockers(client_id=1000)
+        errors: list[tuple[http.HTTPStatus, type[httpapi.APIError]]] = [
+            (http.HTTPStatus.FORBIDDEN, httpapi.NotAuthorizedError),
+            (http.HTTPStatus.INTERNAL_SERVER_ERROR, httpapi.HTTPError),
+        ]
+        for status, exception in errors:
+            http_patcher.get_shockers_raw(status=status)
+            with pytest.raises(exception):
+                pishock_api.get_shockers(client_id=1000)
 
 
 @pytest.mark.parametrize("valid", [True, False])